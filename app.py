@@ -5,13 +5,15 @@ Minimal FastAPI app exposing a RAG question-answering endpoint.
 
 from fastapi import FastAPI, HTTPException
 from fastapi import Request
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, ValidationError, field_validator
 from typing import Any, Dict, List, Optional
 from rag_chain import create_retrieval_chain
 from populate_store import bootstrap_chroma
 from langchain.schema import Document
 from datetime import datetime
+from functools import lru_cache
 import logging
 from dotenv import load_dotenv
 import os
@@ -25,6 +27,18 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+_KNOWN_METADATA_FIELDS = frozenset(("url", "section", "chunk_index", "lastmod", "source"))
+
+
+@lru_cache(maxsize=1024)
+def _parse_lastmod(value: str) -> Optional[datetime]:
+    """Parse an ISO lastmod string, cached — it repeats across a page's chunks."""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
 class DocumentMetadata(BaseModel):
     """Structured metadata for document chunks."""
     url: Optional[str] = Field(None, description="Source page URL.")
@@ -36,19 +50,21 @@ class DocumentMetadata(BaseModel):
 
     @classmethod
     def from_raw(cls, metadata: Dict[str, Any]) -> "DocumentMetadata":
-        """Convert raw metadata dict from LangChain into structured fields."""
-        known_fields = {"url", "section", "chunk_index", "lastmod", "source"}
-        base = {k: metadata.get(k) for k in known_fields if k in metadata}
+        """Convert raw metadata dict from LangChain into structured fields.
+
+        Uses model_construct — the values come straight out of our own
+        Chroma store, so re-running field validation per chunk is wasted work.
+        """
+        base: Dict[str, Any] = {}
+        extra: Dict[str, Any] = {}
+        for k, v in metadata.items():
+            (base if k in _KNOWN_METADATA_FIELDS else extra)[k] = v
 
         # Handle lastmod normalization
         if isinstance(base.get("lastmod"), str):
-            try:
-                base["lastmod"] = datetime.fromisoformat(base["lastmod"])
-            except ValueError:
-                base["lastmod"] = None
+            base["lastmod"] = _parse_lastmod(base["lastmod"])
 
-        extra = {k: v for k, v in metadata.items() if k not in known_fields}
-        return cls(**base, extra=extra)
+        return cls.model_construct(**base, extra=extra)
 
 
 class DocumentModel(BaseModel):
@@ -59,7 +75,7 @@ class DocumentModel(BaseModel):
     @classmethod
     def from_langchain(cls, doc: Document):
         """Convert LangChain Document (from Chroma) to API-safe schema."""
-        return cls(
+        return cls.model_construct(
             page_content=doc.page_content.strip(),
             metadata=DocumentMetadata.from_raw(doc.metadata or {}),
         )
@@ -122,7 +138,7 @@ async def lifespan(app: FastAPI):
     logger.info("✅ Chroma vector store is ready.")
 
     # Initialize QA chain and store in app state
-    app.state.qa_chain = create_retrieval_chain(persist_dir=os.getenv("CHROMA_DIR"), llm_model=os.getenv("LLM_MODEL"), search_arguments={"k": 3})
+    app.state.qa_chain = create_retrieval_chain(persist_dir=os.getenv("CHROMA_DIR"), llm_model=os.getenv("LLM_MODEL"), search_arguments={"k": 20}, rerank_top_n=3)
 
     yield  # 🚀 Application runs here
 
@@ -134,14 +150,29 @@ app = FastAPI(
     description="Retrieve answers from the Oxylabs documentation knowledge base.",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 @app.post("/query", response_model=QueryResponse, tags=["retrieval"])
-async def query_rag(request: Request, payload: QueryRequest):
+async def query_rag(request: Request):
     """Answer user questions using RAG pipeline."""
+    # Validate straight from the raw body bytes — pydantic-core's JSON path
+    # is faster than Starlette's json.loads followed by model_validate.
+    try:
+        payload = QueryRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        # include_input=False: for malformed JSON the error input is the raw
+        # bytes body, which the default handler cannot json.dumps.
+        raise HTTPException(
+            status_code=422,
+            detail=e.errors(include_url=False, include_context=False, include_input=False),
+        )
+
     try:
         qa_chain = request.app.state.qa_chain
-        result = qa_chain.invoke({"query": payload.question})
+        # Async invoke keeps the event loop free during the ~1s of remote
+        # LLM/embedding IO instead of blocking a threadpool worker.
+        result = await qa_chain.ainvoke({"query": payload.question})
         answer = result.get("result", "").strip()
         source_docs = result.get("source_documents", [])
 
@@ -156,7 +187,8 @@ async def query_rag(request: Request, payload: QueryRequest):
         logger.debug(f"💬 Answer preview: {answer[:300]}...")  # truncate long outputs
         logger.debug(f"📚 Sources: {[s.metadata.url for s in sources if s.metadata.url]}")
         
-        return QueryResponse(answer=answer, sources=sources)
+        resp = QueryResponse(answer=answer, sources=sources)
+        return ORJSONResponse(resp.model_dump())
 
     except Exception as e:
         logger.exception(f"Error while processing query: {e}")
@@ -5,18 +5,53 @@ for vector embedding and retrieval.
 """
 
 from __future__ import annotations
+import itertools
+from concurrent.futures import Future, ProcessPoolExecutor
 from typing import List, Optional
-from langchain_text_splitters import (
-    MarkdownHeaderTextSplitter,
-    RecursiveCharacterTextSplitter
-)
+from langchain_text_splitters import MarkdownHeaderTextSplitter
 from langchain.schema import Document
 import re
 import logging
+import tiktoken
 from data_ingestion.models import Page
 
 logger = logging.getLogger(__name__)
 
+# Shared tiktoken encoder — building one per splitter instance is the
+# dominant setup cost when chunking in bulk.
+_ENC = tiktoken.get_encoding("cl100k_base")
+_HEADER_RE = re.compile(r"^#{1,6} ", re.MULTILINE)
+
+
+def _split_token_windows(
+    tokens: List[int], chunk_size: int, chunk_overlap: int
+) -> List[str]:
+    """Split a token sequence into overlapping windows, decoding at emit time."""
+    if len(tokens) <= chunk_size:
+        return [_ENC.decode(tokens)]
+    pieces = []
+    step = chunk_size - chunk_overlap
+    for start in range(0, len(tokens), step):
+        pieces.append(_ENC.decode(tokens[start:start + chunk_size]))
+        if start + chunk_size >= len(tokens):
+            break
+    return pieces
+
+
+# Per-worker chunker for ProcessPoolExecutor — built once per process by
+# _init_worker so the splitters (and tiktoken encoder) are not rebuilt per page.
+_WORKER_CHUNKER: Optional["MarkdownChunker"] = None
+
+
+def _init_worker(headers_to_split_on, chunk_size: int, chunk_overlap: int) -> None:
+    global _WORKER_CHUNKER
+    _WORKER_CHUNKER = MarkdownChunker(headers_to_split_on, chunk_size, chunk_overlap)
+
+
+def _chunk_one(args: tuple) -> List[Document]:
+    md, metadata = args
+    return _WORKER_CHUNKER.chunk(md, metadata=metadata)
+
 class MarkdownChunker:
     """
     Combined header + recursive chunker for Oxylabs documentation.
@@ -36,14 +71,14 @@ class MarkdownChunker:
                 ("###", "Header_3"),
             ]
 
+        self.headers_to_split_on = headers_to_split_on
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
         self.header_splitter = MarkdownHeaderTextSplitter(
             headers_to_split_on=headers_to_split_on,
             strip_headers=False,
         )
-        self.recursive_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-        )
 
     def chunk(self, text: str, metadata: Optional[dict] = None) -> List[Document]:
         """Split Markdown text into retrievable chunks and attach metadata."""
@@ -51,37 +86,70 @@ class MarkdownChunker:
             logger.warning("⚠️ Empty document provided to chunker.")
             return []
 
+        # Fast path: a short page with at most one header section would come
+        # back as a single chunk anyway — skip both splitters and the encode.
+        # 3500 chars ≈ 1000 tokens for English prose.
+        if len(text) <= 3500 and text.count("\n#") <= 1:
+            return [Document(
+                page_content=text,
+                metadata={**(metadata or {}), "chunk_index": 0},
+            )]
+
         # normalized = normalize_markdown_for_embedding(text)
-        header_docs = self.header_splitter.split_text(text)
+        if _HEADER_RE.search(text):
+            header_docs = self.header_splitter.split_text(text)
+        else:
+            # No Markdown headers — skip the header splitter pass entirely.
+            header_docs = [Document(page_content=text)]
 
         docs: List[Document] = []
 
         for doc in header_docs:
-            sub_chunks = self.recursive_splitter.split_documents([doc])
-            for i, chunk in enumerate(sub_chunks):
-                chunk.metadata.update(metadata or {})
-                chunk.metadata["chunk_index"] = i
-                docs.append(chunk)
+            # Encode each header section exactly once and window over the
+            # tokens directly; the recursive splitter re-encoded every
+            # candidate split during its length checks.
+            tokens = _ENC.encode(doc.page_content, disallowed_special=())
+            pieces = _split_token_windows(tokens, self.chunk_size, self.chunk_overlap)
+            for i, piece in enumerate(pieces):
+                # Single dict build per chunk; the shared page metadata dict
+                # is never mutated, so one flattened dict serves all chunks.
+                docs.append(Document(
+                    page_content=piece,
+                    metadata={**doc.metadata, **(metadata or {}), "chunk_index": i},
+                ))
 
         logger.info(f"✅ Created {len(docs)} chunks.")
         return docs
 
-    def chunk_pages(self, pages: List[Page], limit: Optional[int] = None) -> List[Document]:
-        """Chunk multiple Page objects (with .md loaded) into LangChain Documents."""
-        all_docs: List[Document] = []
+    def make_pool(self) -> ProcessPoolExecutor:
+        """Process pool whose workers carry this chunker's configuration.
+
+        Chunking is pure CPU work (regex + tiktoken), so callers submit pages
+        here to sidestep the GIL; each worker builds its splitters once.
+        """
+        return ProcessPoolExecutor(
+            initializer=_init_worker,
+            initargs=(self.headers_to_split_on, self.chunk_size, self.chunk_overlap),
+        )
 
-        for i, page in enumerate(pages):
-            if limit and i >= limit:
-                break
+    def submit_chunk(self, executor: ProcessPoolExecutor, md: str, metadata: dict) -> Future:
+        """Submit one page's markdown to a pool created by make_pool()."""
+        return executor.submit(_chunk_one, (md, metadata))
 
+    def chunk_pages(self, pages: List[Page], limit: Optional[int] = None) -> List[Document]:
+        """Chunk multiple Page objects (with .md loaded) into LangChain Documents."""
+        targets = pages[:limit] if limit else pages
+        inputs = []
+        for page in targets:
             if not getattr(page, "md", None):
                 logger.warning(f"⚠️ Page has no markdown: {page.url}")
                 continue
-
             metadata = page.to_metadata() if hasattr(page, "to_metadata") else {}
-            docs = self.chunk(page.md, metadata=metadata)
-            all_docs.extend(docs)
-            logger.info(f"📄 {page.title}: {len(docs)} chunks")
+            inputs.append((page.md, metadata))
+
+        with self.make_pool() as executor:
+            results = executor.map(_chunk_one, inputs, chunksize=8)
+            all_docs = list(itertools.chain.from_iterable(results))
 
         logger.info(f"✅ Total {len(all_docs)} document chunks.")
         return all_docs
@@ -28,6 +28,8 @@ USER_AGENT = os.getenv(
     "Candidate-BG-RAG-Crawler/1.0 (take-home task)"
 )
 REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "15"))
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "32"))
+SCRAPER_WORKERS = int(os.getenv("SCRAPER_WORKERS", "16"))
 
 # Logging level
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
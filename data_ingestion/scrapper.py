@@ -4,10 +4,12 @@ Downloads and cleans markdown content for discovered pages.
 """
 
 import logging
-from typing import List, Optional, Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, List, Optional, Callable
 import requests
 from data_ingestion.models import Page
 from data_ingestion.utils import make_session
+import data_ingestion.config as config
 
 logger = logging.getLogger(__name__)
 
@@ -15,16 +17,37 @@ logger = logging.getLogger(__name__)
 class DocScraper:
     """Downloads and cleans markdown for documentation pages."""
 
-    def __init__(self, timeout: int = 15, clean_fn: Optional[Callable[[str], str]] = None):
+    def __init__(
+        self,
+        timeout: int = 15,
+        clean_fn: Optional[Callable[[str], str]] = None,
+        max_workers: int = config.SCRAPER_WORKERS,
+    ):
         self.session = make_session()
         self.timeout = timeout
         self.clean_fn = clean_fn
+        self.max_workers = max_workers
 
     def scrape(self, pages: List[Page], limit: Optional[int] = None) -> List[Page]:
-        """Fetch markdown for each page."""
-        for i, page in enumerate(pages):
-            if limit and i >= limit:
-                break
-            page.load(self.session, timeout=self.timeout, clean_fn=self.clean_fn)
+        """Fetch markdown for each page concurrently (IO-bound, thread pool)."""
+        targets = pages[:limit] if limit else pages
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(self._load_page, targets))
         logger.info(f"✅ Scraped {sum(p.loaded for p in pages)} / {len(pages)} pages")
         return pages
+
+    def iter_scrape(self, pages: List[Page], limit: Optional[int] = None) -> Iterator[Page]:
+        """Yield successfully loaded pages as their fetches complete.
+
+        Streaming counterpart of scrape() for pipelines that want to process
+        each page without waiting for the whole crawl to finish.
+        """
+        targets = pages[:limit] if limit else pages
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._load_page, p): p for p in targets}
+            for future in as_completed(futures):
+                if future.result():
+                    yield futures[future]
+
+    def _load_page(self, page: Page) -> bool:
+        return page.load(self.session, timeout=self.timeout, clean_fn=self.clean_fn)
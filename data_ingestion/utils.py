@@ -6,7 +6,10 @@ Utility functions for network requests and sitemap/llms parsing.
 import logging
 import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urljoin, urlparse
+from datetime import datetime
 from xml.etree import ElementTree as ET
 from typing import List, Dict, Optional
 from dateutil import parser as date_parser
@@ -16,16 +19,39 @@ from bs4 import BeautifulSoup
 
 logger = logging.getLogger(__name__)
 
+_LLMS_RE = re.compile(r"- \[([^\]]+)\]\((/[^\)]+\.md)\)")
+_GITBOOK_TAG_RE = re.compile(r"^\s*\{%\s*.*?\s*%\}\s*$", re.MULTILINE)
+
 
 def make_session() -> requests.Session:
     s = requests.Session()
     s.headers.update({"User-Agent": config.USER_AGENT})
+    # Pooled adapter so concurrent fetches reuse keep-alive connections
+    # instead of opening a new TCP+TLS handshake per request.
+    adapter = HTTPAdapter(
+        pool_connections=config.POOL_SIZE,
+        pool_maxsize=config.POOL_SIZE,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    )
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
     return s
 
 
+_SESSION: Optional[requests.Session] = None
+
+
+def _get_session() -> requests.Session:
+    """Lazily created module-level session so one-off requests share a pool."""
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = make_session()
+    return _SESSION
+
+
 def safe_request(url: str, timeout: int = config.REQUEST_TIMEOUT) -> Optional[str]:
     try:
-        resp = make_session().get(url, timeout=timeout)
+        resp = _get_session().get(url, timeout=timeout)
         resp.raise_for_status()
         return resp.text
     except Exception as e:
@@ -33,32 +59,54 @@ def safe_request(url: str, timeout: int = config.REQUEST_TIMEOUT) -> Optional[st
         return None
 
 
+def safe_request_stream(url: str, timeout: int = config.REQUEST_TIMEOUT):
+    """Like safe_request but returns a raw streaming file-like body."""
+    try:
+        resp = _get_session().get(url, timeout=timeout, stream=True)
+        resp.raise_for_status()
+        resp.raw.decode_content = True
+        return resp.raw
+    except Exception as e:
+        logger.warning(f"⚠️ Failed request: {url} ({e})")
+        return None
+
+
 def extract_metadata_from_sitemap(sitemap_url: str) -> Dict[str, dict]:
-    text = safe_request(sitemap_url)
-    if not text:
+    raw = safe_request_stream(sitemap_url)
+    if raw is None:
         return {}
-    root = ET.fromstring(text)
-    ns = {'ns': root.tag[root.tag.find("{")+1:root.tag.find("}")]} if "{" in root.tag else {}
     meta = {}
-    for url_tag in root.findall("ns:url" if ns else "url", ns):
-        loc_elem = url_tag.find("ns:loc" if ns else "loc", ns)
-        if not loc_elem.text:
+    # iterparse consumes the response stream element by element; each <url>
+    # is cleared after extraction so memory stays flat for large sitemaps.
+    for _, elem in ET.iterparse(raw, events=("end",)):
+        if not elem.tag.rsplit("}", 1)[-1] == "url":
             continue
-        loc = loc_elem.text.strip()
-        lastmod, priority = None, None
-        lastmod_elem = url_tag.find("ns:lastmod" if ns else "lastmod", ns)
-        if lastmod_elem is not None and lastmod_elem.text:
-            try:
-                lastmod = date_parser.parse(lastmod_elem.text.strip())
-            except Exception:
-                pass
-        priority_elem = url_tag.find("ns:priority" if ns else "priority", ns)
-        if priority_elem is not None and priority_elem.text:
-            try:
-                priority = float(priority_elem.text.strip())
-            except ValueError:
-                pass
-        meta[loc] = {"lastmod": lastmod, "priority": priority}
+        loc, lastmod, priority = None, None, None
+        for child in elem:
+            tag = child.tag.rsplit("}", 1)[-1]
+            if not child.text:
+                continue
+            if tag == "loc":
+                loc = child.text.strip()
+            elif tag == "lastmod":
+                # Sitemap dates are ISO-8601; fromisoformat is far cheaper
+                # than dateutil's general-purpose parser.
+                value = child.text.strip()
+                try:
+                    lastmod = datetime.fromisoformat(value.replace("Z", "+00:00"))
+                except ValueError:
+                    try:
+                        lastmod = date_parser.parse(value)
+                    except Exception:
+                        pass
+            elif tag == "priority":
+                try:
+                    priority = float(child.text.strip())
+                except ValueError:
+                    pass
+        if loc:
+            meta[loc] = {"lastmod": lastmod, "priority": priority}
+        elem.clear()
     logger.info(f"Extracted metadata for {len(meta)} pages")
     return meta
 
@@ -67,8 +115,7 @@ def extract_pages_from_llms(llms_url: str, base_url: str) -> List[Page]:
     text = safe_request(llms_url)
     if not text:
         return []
-    pattern = re.compile(r"- \[([^\]]+)\]\((/[^\)]+\.md)\)")
-    matches = pattern.findall(text)
+    matches = _LLMS_RE.findall(text)
     pages = []
     for title, md_path in matches:
         web_url = urljoin(base_url, md_path.replace(".md", ""))
@@ -86,14 +133,28 @@ def merge_pages_with_sitemap(pages: List[Page], meta: Dict[str, dict]) -> List[P
             p.priority = meta[str(p.url)].get("priority")
     return pages
 
+# Non-greedy: a table nested inside another is cut at the first </table>;
+# GitBook markdown never emits nested tables, so we accept that edge.
+_TABLE_RE = re.compile(r"<table\b.*?</table>", re.DOTALL | re.IGNORECASE)
+
+
 def convert_html_tables_to_markdown(md: str) -> str:
     """
     Detect and convert HTML <table> blocks into readable Markdown-formatted tables.
     Preserves Markdown syntax and structure.
+
+    Only the <table>...</table> spans are parsed (with lxml's C parser);
+    the surrounding Markdown is never round-tripped through an HTML parser,
+    so most pages — which contain no tables — pay just a substring scan.
     """
-    soup = BeautifulSoup(md, "html.parser")
+    if "<table" not in md.lower():
+        return md
+
+    def _convert(match: re.Match) -> str:
+        table = BeautifulSoup(match.group(0), "lxml").find("table")
+        if table is None:
+            return match.group(0)
 
-    for table in soup.find_all("table"):
         headers = [h.get_text(strip=True) for h in table.find_all("th")]
         rows = []
         for tr in table.find_all("tr"):
@@ -111,14 +172,13 @@ def convert_html_tables_to_markdown(md: str) -> str:
         for r in rows:
             table_lines.append(" | ".join(r))
 
-        table_md = "\n".join(table_lines)
-        table.replace_with("\n" + table_md + "\n")
+        return "\n" + "\n".join(table_lines) + "\n"
 
-    return str(soup)
+    return _TABLE_RE.sub(_convert, md)
 
 def clean_markdown_content(md: str) -> str:
     # Remove full lines that contain only GitBook tags
-    md = re.sub(r"^\s*\{%\s*.*?\s*%\}\s*$", "", md, flags=re.MULTILINE)
+    md = _GITBOOK_TAG_RE.sub("", md)
 
     md = convert_html_tables_to_markdown(md)
     
@@ -7,18 +7,26 @@ Bootstraps the Chroma vector store by:
 3. Chunking into semantic sections.
 4. Embedding and persisting into Chroma DB.
 
+The scrape → chunk → embed stages run as a streaming pipeline connected
+by queues: each page is chunked as soon as it downloads and its markdown
+is released immediately after, so resident memory stays O(batch_size)
+instead of O(corpus).
+
 This file can be run standalone OR imported into FastAPI startup.
 """
 
 import os
+import queue
+import threading
 import logging
+from collections import deque
 from dotenv import load_dotenv
 
 from data_ingestion.crawler import DocCrawler
 from data_ingestion.scrapper import DocScraper
 from data_ingestion.chunker import MarkdownChunker
 from data_ingestion.utils import clean_markdown_content
-from vector_store.chroma_store import ChromaStore
+from vector_store.chroma_store import ChromaStore, dedup_docs
 from data_ingestion.config import BASE_URL, SITEMAP_PATH, LLMS_PATH, EMBED_MODEL, CHROMA_DIR
 
 
@@ -27,13 +35,66 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
 
+# Queue sentinel marking the end of a pipeline stage.
+_DONE = None
+
+# Pages allowed in flight in the chunking pool before the submitter blocks.
+_MAX_IN_FLIGHT = 32
+
+
+# Written into the persist dir only after the pipeline finishes; its absence
+# marks a crashed or interrupted build that must not be served.
+_COMPLETE_MARKER = ".bootstrap_complete"
+
+
+def _marker_path(persist_dir: str) -> str:
+    return os.path.join(persist_dir, _COMPLETE_MARKER)
+
 
-def bootstrap_chroma(persist_dir: str):
+def _dir_nonempty(path: str) -> bool:
+    """True if path is a directory with at least one entry.
+
+    Stops after the first readdir entry and closes the scandir handle,
+    unlike exists() + any(scandir()) which leaked the iterator.
+    """
+    try:
+        with os.scandir(path) as it:
+            return next(it, None) is not None
+    except FileNotFoundError:
+        return False
+
+
+def bootstrap_chroma(persist_dir: str, batch_size: int = 1024):
     """Initialize Chroma vector store if missing."""
-    # Skip if already built
-    if os.path.exists(persist_dir) and any(os.scandir(persist_dir)):
-        logger.info(f"✅ Found existing Chroma index at {persist_dir}, skipping bootstrap.")
-        return
+    chroma_store = ChromaStore(persist_dir=persist_dir, embedding_model=EMBED_MODEL)
+
+    # Skip only an index whose build completed and whose vectors match the
+    # configured embedding width. A missing completion marker means a previous
+    # bootstrap crashed partway (add_batch commits incrementally, so the dir is
+    # non-empty even then); a width mismatch means every query would 500 on a
+    # Chroma dimension mismatch. Rebuild in both cases.
+    if _dir_nonempty(persist_dir):
+        existing = chroma_store.open()
+        stored = chroma_store.stored_dimensions(existing)
+        complete = os.path.exists(_marker_path(persist_dir))
+        dims_ok = stored is not None and (
+            chroma_store.dimensions is None or stored == chroma_store.dimensions
+        )
+        if complete and dims_ok:
+            logger.info(f"✅ Found existing Chroma index at {persist_dir}, skipping bootstrap.")
+            return
+        if not complete:
+            logger.warning(f"⚠️ Index at {persist_dir} is incomplete — rebuilding.")
+        else:
+            logger.warning(
+                f"⚠️ Existing index at {persist_dir} holds {stored}-dim vectors but embeddings "
+                f"are configured for {chroma_store.dimensions} dims — rebuilding."
+            )
+        existing.delete_collection()
+        try:
+            os.remove(_marker_path(persist_dir))
+        except FileNotFoundError:
+            pass
 
     logger.info("🚀 No Chroma index found — building embeddings...")
 
@@ -42,20 +103,110 @@ def bootstrap_chroma(persist_dir: str):
     pages = crawler.crawl(include_sections=["proxies", "advanced-proxy-solutions"])
     logger.info(f"🌐 Crawled {len(pages)} pages.")
 
-    # Scrape content
     scraper = DocScraper(clean_fn=clean_markdown_content)
-    scraped_pages = scraper.scrape(pages)
-    loaded = [p for p in scraped_pages if p.loaded]
-    logger.info(f"🧾 Scraped {len(loaded)} successfully loaded pages.")
-
-    # Chunk
     chunker = MarkdownChunker()
-    chunks = chunker.chunk_pages(loaded)
-    logger.info(f"✂️ Created {len(chunks)} chunks total.")
 
-    # Build Chroma index
-    chroma_store = ChromaStore(persist_dir=persist_dir, embedding_model=EMBED_MODEL)
-    chroma_store.build(chunks)
+    # Bounded queues apply backpressure so no stage can run far ahead.
+    page_queue: queue.Queue = queue.Queue(maxsize=64)
+    chunk_queue: queue.Queue = queue.Queue(maxsize=4 * batch_size)
+
+    # Worker exceptions are collected here and re-raised after the join so a
+    # failing stage aborts bootstrap loudly instead of hanging the lifespan.
+    errors: list = []
+    counts = {"embedded": 0}
+
+    def _drain(q: queue.Queue):
+        """Consume a queue until its sentinel so upstream puts can't block."""
+        while q.get() is not _DONE:
+            pass
+
+    def scrape_worker():
+        try:
+            for page in scraper.iter_scrape(pages):
+                page_queue.put(page)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            # Always sent, even on failure — downstream must not wait forever.
+            page_queue.put(_DONE)
+
+    def chunk_worker():
+        done = False
+        try:
+            # Chunking is CPU-bound, so pages are submitted to the chunker's
+            # process pool; a bounded in-flight window keeps memory flat while
+            # letting several pages split in parallel.
+            with chunker.make_pool() as executor:
+                in_flight: deque = deque()
+
+                def flush_oldest():
+                    for doc in in_flight.popleft().result():
+                        chunk_queue.put(doc)
+
+                while (page := page_queue.get()) is not _DONE:
+                    in_flight.append(
+                        chunker.submit_chunk(executor, page.md, page.to_metadata())
+                    )
+                    page.md = None  # markdown is no longer needed once submitted
+                    while in_flight and (in_flight[0].done() or len(in_flight) >= _MAX_IN_FLIGHT):
+                        flush_oldest()
+                done = True
+                while in_flight:
+                    flush_oldest()
+        except Exception as e:
+            errors.append(e)
+            if not done:
+                _drain(page_queue)  # unblock the scraper on the bounded queue
+        finally:
+            chunk_queue.put(_DONE)
+
+    def embed_worker():
+        done = False
+        try:
+            store = chroma_store.open()
+            buffer, seen_hashes = [], set()
+
+            def flush(batch):
+                # Dedup once per flush; dedup_docs logs one summary line.
+                uniq = dedup_docs(batch, seen_hashes)
+                if uniq:
+                    chroma_store.add_batch(store, uniq, start_id=counts["embedded"])
+                    counts["embedded"] += len(uniq)
+
+            while True:
+                doc = chunk_queue.get()
+                if doc is _DONE:
+                    done = True
+                    break
+                buffer.append(doc)
+                if len(buffer) >= batch_size:
+                    flush(buffer)
+                    buffer = []
+            if buffer:
+                flush(buffer)
+        except Exception as e:
+            errors.append(e)
+            if not done:
+                _drain(chunk_queue)
+
+    threads = [
+        threading.Thread(target=scrape_worker, name="scrape", daemon=True),
+        threading.Thread(target=chunk_worker, name="chunk", daemon=True),
+        threading.Thread(target=embed_worker, name="embed", daemon=True),
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    if errors:
+        raise RuntimeError("Chroma bootstrap pipeline failed") from errors[0]
+
+    # Only now is the index safe to serve on later startups.
+    with open(_marker_path(persist_dir), "w") as f:
+        f.write(f"embedded={counts['embedded']}\n")
+
+    logger.info(f"✂️ Embedded {counts['embedded']} chunks total.")
     logger.info(f"✅ Chroma vector store initialized and saved to {persist_dir}.")
 
 
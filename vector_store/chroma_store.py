@@ -9,12 +9,47 @@ from typing import List, Optional
 from langchain_openai import OpenAIEmbeddings
 from langchain_chroma import Chroma
 from langchain.schema import Document
+import asyncio
+import hashlib
+import httpx
 import logging
 import os
 
 logger = logging.getLogger(__name__)
 
 
+def dedup_docs(docs: List[Document], seen: set) -> List[Document]:
+    """Drop documents whose page_content hash is already in seen, keeping the first.
+
+    GitBook pages share boilerplate (install snippets, code examples), so
+    identical chunks recur across sections; embedding them again costs OpenAI
+    tokens and duplicate vectors. Content is hashed (blake2b-8) so the seen
+    set stays small across incremental batches.
+    """
+    uniq = []
+    for doc in docs:
+        digest = hashlib.blake2b(doc.page_content.encode(), digest_size=8).digest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+        uniq.append(doc)
+    if len(uniq) < len(docs):
+        logger.info(f"♻️ Skipped {len(docs) - len(uniq)} duplicate chunks.")
+    return uniq
+
+
+def make_async_http_client() -> httpx.AsyncClient:
+    """HTTP/2 client for OpenAI calls.
+
+    HTTP/2 multiplexes the concurrent embedding/chat requests over one
+    connection instead of opening a TLS handshake per in-flight call.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=32),
+    )
+
+
 class ChromaStore:
     """
     Manages creation, persistence, and querying of a Chroma vector store.
@@ -24,56 +59,150 @@ class ChromaStore:
         self,
         persist_dir: str = "./vector_store",
         embedding_model: str = "text-embedding-3-small",
+        dimensions: Optional[int] = 256,
     ):
         """
         Args:
             persist_dir: directory to persist the Chroma database
             embedding_model: OpenAI embedding model name
+            dimensions: requested embedding width (OpenAI Matryoshka
+                truncation); None keeps the model's native size. Must match
+                between build and query time.
         """
         self.persist_dir = persist_dir
+        self.dimensions = dimensions
         os.makedirs(self.persist_dir, exist_ok=True)
 
-        self.embeddings = OpenAIEmbeddings(model=embedding_model)
-        logger.info(f"🧠 Using embedding model: {embedding_model}")
+        self.embeddings = OpenAIEmbeddings(
+            model=embedding_model,
+            dimensions=dimensions,
+            http_async_client=make_async_http_client(),
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        logger.info(f"🧠 Using embedding model: {embedding_model} (dimensions={dimensions})")
+
+    def _run(self, coro):
+        """Run a coroutine on the store's private event loop (created lazily).
+
+        asyncio.run would spin up and tear down a loop per call, leaving the
+        shared async HTTP client's pooled connections bound to a dead loop
+        between batches.
+        """
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+
+    async def _embed_batches(
+        self, batches: List[List[str]], concurrency: int = 8
+    ) -> List[List[float]]:
+        """Embed batches of texts concurrently, bounded by a semaphore."""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _embed_one(i: int, batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                logger.info(f"🔹 Embedding batch {i + 1}/{len(batches)}")
+                return await self.embeddings.aembed_documents(batch)
+
+        results = await asyncio.gather(
+            *(_embed_one(i, batch) for i, batch in enumerate(batches))
+        )
+        return [vector for batch in results for vector in batch]
 
-    def build(self, docs: List[Document], batch_size: int = 100) -> Chroma:
-        """Build Chroma store with automatic batching to avoid OpenAI token limit."""
+    def build(self, docs: List[Document], batch_size: int = 1024, concurrency: int = 8) -> Chroma:
+        """Build Chroma store with batched, concurrent embedding calls.
+
+        Batching stays below the OpenAI token limit; the batches are embedded
+        concurrently (network-bound) instead of one blocking call each, and the
+        precomputed vectors are inserted with a single collection.add.
+        """
         if not docs:
             logger.warning("⚠️ No documents to embed.")
             return None
 
-        store = None
-        total = len(docs)
-        for i in range(0, total, batch_size):
-            batch = docs[i:i + batch_size]
-            logger.info(f"🔹 Embedding batch {i // batch_size + 1}/{(total // batch_size) + 1}")
-
-            if store is None:
-                store = Chroma.from_documents(
-                    batch,
-                    embedding=self.embeddings,
-                    persist_directory=self.persist_dir,
-                    collection_name="docs_collection"
-                )
-            else:
-                store.add_documents(batch)
-
-        logger.info(f"✅ Built Chroma store with {total} documents.")
+        docs = dedup_docs(docs, set())
+        texts = [d.page_content for d in docs]
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        vectors = self._run(self._embed_batches(batches, concurrency=concurrency))
+
+        store = self.open()
+        store._collection.add(
+            ids=[f"doc-{i}" for i in range(len(docs))],
+            embeddings=vectors,
+            documents=texts,
+            metadatas=[d.metadata for d in docs],
+        )
+
+        logger.info(f"✅ Built Chroma store with {len(docs)} documents.")
         return store
 
 
+    def open(self) -> Chroma:
+        """Open the persistent store for incremental writes (created if missing)."""
+        return Chroma(
+            collection_name="docs_collection",
+            embedding_function=self.embeddings,
+            persist_directory=self.persist_dir,
+        )
+
+    def add_batch(
+        self,
+        store: Chroma,
+        docs: List[Document],
+        start_id: int = 0,
+        embed_batch_size: int = 128,
+        concurrency: int = 8,
+    ) -> None:
+        """Embed one batch of documents and append it to an open store.
+
+        The batch is fanned out to concurrent aembed_documents sub-requests
+        rather than one serial embed_documents call.
+        """
+        texts = [d.page_content for d in docs]
+        batches = [texts[i:i + embed_batch_size] for i in range(0, len(texts), embed_batch_size)]
+        vectors = self._run(self._embed_batches(batches, concurrency=concurrency))
+        store._collection.add(
+            ids=[f"doc-{start_id + i}" for i in range(len(docs))],
+            embeddings=vectors,
+            documents=texts,
+            metadatas=[d.metadata for d in docs],
+        )
+
+    def stored_dimensions(self, store: Chroma) -> Optional[int]:
+        """Vector width of the persisted collection, or None if empty/unreadable."""
+        try:
+            peek = store._collection.peek(1)
+            embeddings = peek.get("embeddings")
+            if embeddings is not None and len(embeddings):
+                return len(embeddings[0])
+        except Exception:
+            pass
+        return None
+
     def load(self) -> Optional[Chroma]:
-        """Load an existing Chroma vector store."""
+        """Load an existing Chroma vector store.
+
+        Raises RuntimeError if the persisted vectors were embedded at a
+        different width than this store is configured for — otherwise every
+        query would fail with a Chroma dimension mismatch.
+        """
         if not os.path.exists(self.persist_dir):
             logger.warning(f"⚠️ No Chroma store found at {self.persist_dir}")
             return None
 
         logger.info(f"📂 Loading existing Chroma store from {self.persist_dir}")
-        return Chroma(
+        store = Chroma(
             collection_name="docs_collection",
             embedding_function=self.embeddings,
             persist_directory=self.persist_dir,
         )
+        stored = self.stored_dimensions(store)
+        if stored is not None and self.dimensions is not None and stored != self.dimensions:
+            raise RuntimeError(
+                f"Chroma store at {self.persist_dir} holds {stored}-dim vectors but "
+                f"embeddings are configured for {self.dimensions} dims — rebuild the "
+                f"index (delete the persist directory) or match the dimensions."
+            )
+        return store
 
     def as_retriever(self, store: Chroma, k: int = 3):
         """Return the store as a LangChain retriever."""